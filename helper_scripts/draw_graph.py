@@ -1,36 +1,312 @@
+import functools
+import hashlib
+import os
+import tempfile
+import zipfile
 from typing import Optional, Union
 
-import matplotlib as mpl
 import matplotlib.lines as mlines
 import matplotlib.pyplot as plt
 import networkx as nx
+import numpy as np
+import pandas as pd
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_hex, to_rgba
+from scipy import optimize, sparse
 
+try:
+    import numba
+except ImportError:  # numba is optional, curve_segments falls back to NumPy broadcasting
+    numba = None
 
-def prepare_drawing(G, groups: list, random_seed: int = 42, **kwargs) -> tuple[dict, list, list]:
+try:
+    import datashader
+    import datashader.transfer_functions as tf
+except ImportError:  # datashader is optional, only needed for draw_graph(backend="datashader")
+    datashader = None
+
+LAYOUT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "draw_graph")
+
+# Matplotlib style, edge color and face color per color mode
+GRAPH_STYLES = {
+    "dark": ("cyberpunk", "#A47FFF", "#13042B"),
+    "light": ("seaborn-darkgrid", "k", "w"),
+}
+
+
+def index_positions(G, pos: dict) -> tuple[dict, np.ndarray]:
+    # Map every node to a row of a (n, 2) position array so lookups become integer indexing.
+    # pos may only cover the drawn nodes, rows of the other nodes are NaN
+    node_idx = {node: idx for idx, node in enumerate(G.nodes())}
+    missing = (np.nan, np.nan)
+    pos_xy = np.array([pos.get(node, missing) for node in G.nodes()], dtype=float)
+    pos_xy = pos_xy.reshape(len(node_idx), 2)
+    return node_idx, pos_xy
+
+
+def visible_mask(
+    pos_xy: np.ndarray, xlim: Optional[tuple] = None, ylim: Optional[tuple] = None
+) -> np.ndarray:
+    visible = np.ones(len(pos_xy), dtype=bool)
+    for dim, lim in enumerate((xlim, ylim)):
+        if lim is not None:
+            visible &= (pos_xy[:, dim] >= min(lim)) & (pos_xy[:, dim] <= max(lim))
+    return visible
+
+
+def padded_limits(points: np.ndarray, margins: tuple) -> tuple[tuple, tuple]:
+    # Same limits autoscaling would pick: the data range widened by the axes margins
+    low, high = points.min(axis=0), points.max(axis=0)
+    pad = np.where(high > low, high - low, 1.0) * np.asarray(margins)
+    return (low[0] - pad[0], high[0] + pad[0]), (low[1] - pad[1], high[1] + pad[1])
+
+
+def layout_cache_key(G, random_seed: int, **kwargs) -> str:
+    # Nodes and edges are kept in graph order, sorting them fails for mixed type node labels. The
+    # edges carry the attribute the layout reads its weights from
+    key = repr(
+        (
+            G.is_directed(),
+            list(G.nodes()),
+            list(G.edges(data=kwargs.get("weight", "weight"))),
+            random_seed,
+            sorted(kwargs.items()),
+        )
+    )
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+def load_cached_layout(cache_file: str, G) -> Optional[dict]:
+    # A missing, truncated or mismatching cache file is treated as a cache miss
+    try:
+        with np.load(cache_file) as cached:
+            coords = cached["pos"]
+    except (OSError, EOFError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+    if len(coords) != G.number_of_nodes():
+        return None
+    return dict(zip(G.nodes(), coords))
+
+
+def save_cached_layout(cache_file: str, G, pos: dict):
+    # Write to a temporary file first so an interrupted write never leaves a broken cache entry.
+    # The cache is best effort, a failed write only skips caching this layout
+    cache_dir = os.path.dirname(cache_file)
+    tmp_name = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=cache_dir, suffix=".npz.tmp", delete=False
+        ) as tmp_file:
+            tmp_name = tmp_file.name
+            np.savez(tmp_file, pos=np.array([pos[node] for node in G.nodes()]))
+        os.replace(tmp_name, cache_file)
+    except OSError:
+        if tmp_name is not None and os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+
+
+def lbfgs_layout(
+    G,
+    seed: Optional[int] = None,
+    k: Optional[float] = None,
+    iterations: int = 200,
+    weight: str = "weight",
+    dim: int = 2,
+    block_size: int = 256,
+    gravity: float = 0.1,
+) -> dict:
+    # Fruchterman-Reingold layout found by minimizing the energy whose gradient is the FR force
+    # (attraction d^2 / k along edges, repulsion k^2 / d between all pairs) with L-BFGS-B. The
+    # repulsion energy keeps falling as disconnected components drift apart, a gravity term
+    # pulling every node towards the origin bounds it from below
+    nodes = list(G.nodes())
+    n_nodes = len(nodes)
+    if n_nodes == 0:
+        return {}
+    if n_nodes == 1:
+        return {nodes[0]: np.zeros(dim)}
+    if k is None:
+        k = 1 / np.sqrt(n_nodes)
+
+    undirected = G.to_undirected(as_view=True)
+    adjacency = nx.to_scipy_sparse_array(undirected, nodelist=nodes, weight=weight)
+    edges = sparse.triu(adjacency, k=1).tocoo()
+    rows, cols, weights = edges.row, edges.col, edges.data
+
+    def energy(flat_pos):
+        pos = flat_pos.reshape(n_nodes, dim)
+        delta = pos[rows] - pos[cols]
+        distance = np.sqrt((delta**2).sum(axis=1))
+        value = (weights * distance**3).sum() / (3 * k)
+        edge_grad = (weights * distance / k)[:, None] * delta
+        value += gravity * (pos**2).sum() / 2
+        grad = gravity * pos
+        np.add.at(grad, rows, edge_grad)
+        np.add.at(grad, cols, -edge_grad)
+
+        # All pairs repulsion, in blocks of rows to keep memory at O(block_size * n). The squared
+        # distances are softened so coinciding nodes keep a finite, consistent energy and gradient
+        sq_norms = (pos**2).sum(axis=1)
+        for start in range(0, n_nodes, block_size):
+            stop = min(start + block_size, n_nodes)
+            block = pos[start:stop]
+            distance_sq = sq_norms[start:stop, None] + sq_norms[None, :] - 2 * block @ pos.T
+            distance_sq = np.maximum(distance_sq, 0) + 1e-4
+            diagonal = np.arange(stop - start), np.arange(start, stop)
+            distance_sq[diagonal] = 1
+            value -= k**2 / 4 * np.log(distance_sq).sum()
+            inv_distance_sq = 1 / distance_sq
+            inv_distance_sq[diagonal] = 0
+            grad[start:stop] -= k**2 * (
+                block * inv_distance_sq.sum(axis=1)[:, None] - inv_distance_sq @ pos
+            )
+        return value, grad.ravel()
+
+    initial_pos = np.random.RandomState(seed).rand(n_nodes, dim)
+    result = optimize.minimize(
+        energy,
+        initial_pos.ravel(),
+        method="L-BFGS-B",
+        jac=True,
+        options={"maxiter": iterations},
+    )
+    pos = nx.rescale_layout(result.x.reshape(n_nodes, dim))
+    return dict(zip(nodes, pos))
+
+
+def prepare_drawing(
+    G,
+    groups: list,
+    random_seed: int = 42,
+    layout: str = "spring",
+    cache_dir: Optional[str] = LAYOUT_CACHE_DIR,
+    **kwargs,
+) -> tuple[dict, list, list]:
+    if layout not in ("spring", "lbfgs"):
+        raise ValueError(f"Unknown layout '{layout}', expected 'spring' or 'lbfgs'")
+
+    groups = set(groups)
     left_nodes, right_nodes = [], []
     for node in G.nodes():
         if node in groups:
             left_nodes.append(node)
         else:
             right_nodes.append(node)
-    pos = nx.drawing.layout.spring_layout(G, seed=random_seed, **kwargs)
+
+    # Layouts are expensive, so keep them on disk keyed by graph, seed and layout args. Unseeded
+    # layouts are meant to differ between calls and are never cached
+    cache_file = None
+    if cache_dir is not None and random_seed is not None:
+        cache_key = layout_cache_key(G, random_seed, layout=layout, **kwargs)
+        cache_file = os.path.join(cache_dir, f"{cache_key}.npz")
+        pos = load_cached_layout(cache_file, G)
+        if pos is not None:
+            return pos, left_nodes, right_nodes
+
+    if layout == "lbfgs":
+        pos = lbfgs_layout(G, seed=random_seed, **kwargs)
+    else:
+        pos = nx.drawing.layout.spring_layout(G, seed=random_seed, **kwargs)
+    if cache_file is not None:
+        save_cached_layout(cache_file, G, pos)
     return pos, left_nodes, right_nodes
 
 
+if numba is not None:
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def sample_bezier(px, py, qx, qy, rad, out_x, out_y):
+        n_points = out_x.shape[1]
+        for edge in numba.prange(px.shape[0]):
+            cx = (px[edge] + qx[edge]) / 2 + rad * (qy[edge] - py[edge])
+            cy = (py[edge] + qy[edge]) / 2 - rad * (qx[edge] - px[edge])
+            for i in range(n_points):
+                t = i / (n_points - 1)
+                a, b, c = (1 - t) ** 2, 2 * (1 - t) * t, t**2
+                out_x[edge, i] = a * px[edge] + b * cx + c * qx[edge]
+                out_y[edge, i] = a * py[edge] + b * cy + c * qy[edge]
+
+
+def curve_segments(segments: np.ndarray, rad: float = 0.1, n_points: int = 16) -> np.ndarray:
+    # Sample the quadratic Bezier curve matplotlib draws for connectionstyle "arc3, rad=<rad>"
+    if numba is not None:
+        out_x = np.empty((len(segments), n_points))
+        out_y = np.empty((len(segments), n_points))
+        px, py, qx, qy = (np.ascontiguousarray(segments[:, i, j]) for i in (0, 1) for j in (0, 1))
+        sample_bezier(px, py, qx, qy, rad, out_x, out_y)
+        return np.stack((out_x, out_y), axis=-1)
+
+    start, end = segments[:, 0, None], segments[:, 1, None]
+    delta = end - start
+    control = (start + end) / 2 + rad * np.stack((delta[..., 1], -delta[..., 0]), axis=-1)
+    t = np.linspace(0, 1, n_points)[None, :, None]
+    return (1 - t) ** 2 * start + 2 * (1 - t) * t * control + t**2 * end
+
+
+@functools.lru_cache(maxsize=64)
+def legend_handle(color: tuple, size: int, name: str) -> mlines.Line2D:
+    # color has to be hashable, make_legend passes it as an RGBA tuple. The cache is bounded so
+    # it only keeps the handles of recent legends alive
+    return mlines.Line2D(
+        [],
+        [],
+        color=color,
+        marker="o",
+        linestyle="None",
+        markersize=size,
+        label=name,
+    )
+
+
+def shade_edges(
+    ax,
+    segments: np.ndarray,
+    weights: np.ndarray,
+    color_indices: np.ndarray,
+    colors: list,
+    xlim: tuple,
+    ylim: tuple,
+    min_alpha: float = 0.15,
+    zorder=1,
+):
+    # Aggregate the edge polylines into a pixel grid and show it as a single image. The edge
+    # weights go into the aggregate, so they set the intensity instead of a line width, and
+    # min_alpha is the opacity of the faintest drawn pixel. Edges are aggregated per color, the
+    # index into colors, and shaded together so intensities are comparable across colors. The
+    # axes should have their final size, the raster is sized to match it
+    n_edges, n_points, _ = segments.shape
+    # A NaN row after every edge splits the polylines
+    lines = np.full((n_edges, n_points + 1, 3), np.nan)
+    lines[:, :n_points, :2] = segments
+    lines[:, :, 2] = weights[:, None]
+    lines = pd.DataFrame(lines.reshape(-1, 3), columns=["x", "y", "weight"])
+    lines["color"] = pd.Categorical(
+        np.repeat(color_indices, n_points + 1), categories=range(len(colors))
+    )
+
+    bbox = ax.get_window_extent()
+    canvas = datashader.Canvas(
+        plot_width=max(round(bbox.width), 1),
+        plot_height=max(round(bbox.height), 1),
+        x_range=xlim,
+        y_range=ylim,
+    )
+    agg = canvas.line(lines, "x", "y", agg=datashader.by("color", datashader.sum("weight")))
+    color_key = [to_hex(color) for color in colors]
+    image = tf.shade(agg, color_key=color_key, min_alpha=int(255 * min_alpha))
+    ax.imshow(
+        image.to_pil(),
+        extent=(*xlim, *ylim),
+        aspect="auto",
+        interpolation="nearest",
+        zorder=zorder,
+    )
+
+
 def make_legend(_dict, size: int, loc: str):
-    patches = list()
-    for name, color in _dict.items():
-        patches.append(
-            mlines.Line2D(
-                [],
-                [],
-                color=color,
-                marker="o",
-                linestyle="None",
-                markersize=size,
-                label=name,
-            )
-        )
+    # The legend only reads the handles through update_from, so the cached ones are passed as is
+    patches = [legend_handle(to_rgba(color), size, name) for name, color in _dict.items()]
     plt.legend(handles=patches, loc=loc)
 
 
@@ -39,7 +315,8 @@ def draw_nodes(
     pos,
     ax,
     node_list: list,
-    size_dict: dict,
+    node_indices: np.ndarray,
+    size_arr: np.ndarray,
     add_labels: bool,
     label_dict: dict,
     color: Union[str, list] = "C0",
@@ -49,24 +326,49 @@ def draw_nodes(
     font_color="k",
     style=None,
     zorder=None,
+    rasterize: bool = False,
 ):
-    sizes = [size_dict[node] / node_size_reduction_factor for node in node_list]
+    sizes = size_arr[node_indices] / node_size_reduction_factor
+    # Don't draw marker edges for nodes
     node_collection = nx.draw_networkx_nodes(
-        G, pos, nodelist=node_list, alpha=node_alpha, node_size=sizes, node_color=color, ax=ax
+        G,
+        pos,
+        nodelist=node_list,
+        alpha=node_alpha,
+        node_size=sizes,
+        node_color=color,
+        edgecolors="none",
+        ax=ax,
     )
 
     if zorder:
         node_collection.set_zorder(zorder)
+    if rasterize:
+        node_collection.set_rasterized(True)
 
     if add_labels:
-        labels = {node: label_dict.get(node, "") for node in node_list}
-        texts = nx.draw_networkx_labels(
-            G, pos, labels=labels, font_size=font_size, font_color=font_color, ax=ax
-        )
-
-    if style is not None and add_labels:
-        for _, text_obj in texts.items():  # type: ignore
-            text_obj.set_style(style)
+        # Only drawn nodes with a non-empty label get a Text artist, falsy labels like 0 are kept
+        drawn_nodes = set(node_list)
+        labels = [
+            (node, label)
+            for node, label in label_dict.items()
+            if label is not None and label != "" and node in drawn_nodes
+        ]
+        for node, label in labels:
+            x, y = pos[node]
+            ax.text(
+                x,
+                y,
+                label,
+                fontsize=font_size,
+                color=font_color,
+                family="sans-serif",
+                style=style,
+                horizontalalignment="center",
+                verticalalignment="center",
+                transform=ax.transData,
+                clip_on=True,
+            )
 
 
 def draw_graph(
@@ -90,101 +392,180 @@ def draw_graph(
     legend_labels: dict = None,
     legend_size: int = 5,
     legend_loc: str = "best",
+    xlim: Optional[tuple] = None,
+    ylim: Optional[tuple] = None,
+    rasterize: bool = False,
+    backend: str = "matplotlib",
     **kwargs,
 ):
-    if ax is None:
-        _, ax = plt.subplots(1, 1, figsize=figsize, dpi=dpi)
-        no_ax_input = True
-    else:
-        no_ax_input = False
-    # plt.figure(figsize=figsize, dpi=dpi)
-    if dark_mode:
-        plt.style.use("cyberpunk")
-        edge_color = "#A47FFF"
-        face_color = "#13042B"
-    else:
-        plt.style.use("seaborn-darkgrid")
-        edge_color = "k"
-        face_color = "w"
-
-    for idx, (nodes_draw, nodes_labels, node_font_color, node_sizes) in enumerate(
-        zip(nodes_draw_list, nodes_labels_list, nodes_font_colors, nodes_sizes_list)
-    ):
-        if node_colors is not None:
-            default_color = "grey"
-            _node_colors = [node_colors.get(node, default_color) for node in nodes_draw]
+    if backend not in ("matplotlib", "datashader"):
+        raise ValueError(f"Unknown backend '{backend}', expected 'matplotlib' or 'datashader'")
+    if backend == "datashader" and datashader is None:
+        raise ImportError("draw_graph(backend='datashader') requires the datashader package")
+    # The style is only applied while drawing instead of changing the global rcParams on every call
+    mpl_style, edge_color, face_color = GRAPH_STYLES["dark" if dark_mode else "light"]
+    with plt.style.context(mpl_style):
+        if ax is None:
+            _, ax = plt.subplots(1, 1, figsize=figsize, dpi=dpi)
+            no_ax_input = True
         else:
-            _node_colors = f"C{idx}"
-        draw_nodes(
-            G,
-            pos,
-            ax=ax,
-            node_list=nodes_draw,
-            size_dict=node_sizes,
-            add_labels=add_labels,
-            color=_node_colors,
-            label_dict=nodes_labels,
-            node_alpha=node_alpha,
-            font_color=node_font_color,
-            node_size_reduction_factor=node_size_reduction_factor,
-            **kwargs,
+            no_ax_input = False
+        # Autoscaling stays off while the collections are added, the limits are set once at the end.
+        # Data the caller already drew on the axes is kept in view and autoscaling is restored, axes
+        # the caller stopped autoscaling keep their limits
+        autoscale_on = ax.get_autoscalex_on(), ax.get_autoscaley_on()
+        prior_data = ax.dataLim.get_points() if ax.has_data() else None
+        view_xlim = xlim if xlim is not None or autoscale_on[0] else ax.get_xlim()
+        view_ylim = ylim if ylim is not None or autoscale_on[1] else ax.get_ylim()
+        ax.set_autoscale_on(False)
+
+        node_idx, pos_xy = index_positions(G, pos)
+        node_size_dict = {**nodes_sizes_list[0], **nodes_sizes_list[1]}
+        size_arr = np.fromiter(
+            (node_size_dict[node] for node in node_idx), dtype=float, count=len(node_idx)
         )
 
-    node_size_dict = dict(nodes_sizes_list[0], **nodes_sizes_list[1])
-    node_size = [node_size_dict[node] / node_size_reduction_factor for node in G.nodes()]
-
-    if curved_edges:
-        # see http://stackoverflow.com/a/65213187/3240855
-        G_for_edge_drawing = G.copy()
-        additional_edge_args = {
-            "connectionstyle": "arc3, rad=0.1",
-            "arrows": True,
-            "arrowstyle": "-",  # "-" instead of "->" to avoid arrowheads
-            "node_size": node_size,  # because drawing arrows considers node sizes
-        }
-    else:
-        G_for_edge_drawing = G.to_undirected()
-        additional_edge_args = {}
-
-    for node1 in nodes_draw_list[0]:
-        for node2 in nodes_draw_list[1]:
-            if G.has_edge(node1, node2):
-                weight = G[node1][node2]["weight"]
-                linewidth = weight / edge_linewidth_reduction_factor
-
-                color = edge_color
-                if node_colors is not None:
-                    if node1 in node_colors:
-                        color = node_colors[node1]
-                    elif node2 in node_colors:
-                        color = node_colors[node2]
-
-                nx.draw_networkx_edges(
-                    G_for_edge_drawing,
-                    pos,
-                    edge_color=color,
-                    edgelist=[(node1, node2)],
-                    alpha=edge_alpha,
-                    width=linewidth,
-                    ax=ax,
-                    **additional_edge_args,
-                )
-    # Don't draw marker edges for nodes
-    for p in ax.collections:
-        if type(p) == mpl.collections.PathCollection:
-            p.set_edgecolors("None")
-
-    if dark_mode:
-        ax.set_facecolor(face_color)
-    if legend_labels is not None and no_ax_input:
-        make_legend(legend_labels, loc=legend_loc, size=legend_size)
-    ax.axis("off")
-    plt.tight_layout()
-    if no_ax_input:
-        plt.gcf().set_facecolor(face_color)
-        plt.show()
-    else:
-        return face_color
+        # Nodes and edges outside of the requested or fixed view are never handed to matplotlib
+        visible = None
+        if view_xlim is not None or view_ylim is not None:
+            visible = visible_mask(pos_xy, view_xlim, view_ylim)
+
+        drawn_points = []
+        for idx, (nodes_draw, nodes_labels, node_font_color) in enumerate(
+            zip(nodes_draw_list, nodes_labels_list, nodes_font_colors)
+        ):
+            if visible is not None:
+                nodes_draw = [node for node in nodes_draw if visible[node_idx[node]]]
+            node_indices = np.fromiter(
+                (node_idx[node] for node in nodes_draw), dtype=int, count=len(nodes_draw)
+            )
+            drawn_points.append(pos_xy[node_indices])
+            if node_colors is not None:
+                # Only the drawn nodes are looked up, which may be far fewer than the nodes of G
+                default_color = "grey"
+                _node_colors = [node_colors.get(node, default_color) for node in nodes_draw]
+            else:
+                _node_colors = f"C{idx}"
+            draw_nodes(
+                G,
+                pos,
+                ax=ax,
+                node_list=nodes_draw,
+                node_indices=node_indices,
+                size_arr=size_arr,
+                add_labels=add_labels,
+                color=_node_colors,
+                label_dict=nodes_labels,
+                node_alpha=node_alpha,
+                font_color=node_font_color,
+                node_size_reduction_factor=node_size_reduction_factor,
+                rasterize=rasterize,
+                **kwargs,
+            )
+
+        left_nodes, right_nodes = set(nodes_draw_list[0]), set(nodes_draw_list[1])
+        # Edges are bucketed by color so every bucket becomes one single colored LineCollection.
+        # Buckets are keyed by RGBA because matplotlib colors may be unhashable (lists, arrays).
+        # The key is resolved once per coloring node instead of once per edge
+        edge_groups = {}
+        edge_color_key = to_rgba(edge_color)
+        color_keys = {}
+        # Edges are reported from their left node, so node1 is always the left one
+        for node1, node2, weight in G.edges(nbunch=left_nodes, data="weight", default=1.0):
+            if node2 not in right_nodes:
+                continue
+
+            color, color_key = edge_color, edge_color_key
+            if node_colors is not None:
+                color_node = None
+                if node1 in node_colors:
+                    color_node = node1
+                elif node2 in node_colors:
+                    color_node = node2
+                if color_node is not None:
+                    color = node_colors[color_node]
+                    if color_node not in color_keys:
+                        color_keys[color_node] = to_rgba(color)
+                    color_key = color_keys[color_node]
+            if color_key not in edge_groups:
+                edge_groups[color_key] = (color, [], [])
+            _, edges, weights = edge_groups[color_key]
+            edges.append((node_idx[node1], node_idx[node2]))
+            weights.append(weight)
+
+        shaded_edges = []
+        for color, edges, weights in edge_groups.values():
+            edges, weights = np.array(edges), np.array(weights)
+            if visible is not None:
+                # Keep edges that enter the view even if one of their ends lies outside of it
+                edge_visible = visible[edges].any(axis=1)
+                edges, weights = edges[edge_visible], weights[edge_visible]
+                if len(edges) == 0:
+                    continue
+            segments = pos_xy[edges]
+            if curved_edges:
+                # see http://stackoverflow.com/a/65213187/3240855
+                segments = curve_segments(segments)
+            drawn_points.append(segments.reshape(-1, 2))
+            if backend == "datashader":
+                # Rasterized once the final axes limits and size are known. The edge alpha is
+                # used as the minimum alpha, line widths and rasterize don't apply to the image
+                shaded_edges.append((segments, weights, color))
+                continue
+            edge_collection = LineCollection(
+                segments,
+                linewidths=weights / edge_linewidth_reduction_factor,
+                alpha=edge_alpha,
+                zorder=1,
+                rasterized=rasterize,
+            )
+            edge_collection.set_color(color)
+            ax.add_collection(edge_collection, autolim=False)
+
+        drawn_points = np.concatenate(drawn_points)
+        if prior_data is not None:
+            drawn_points = np.concatenate([drawn_points, prior_data])
+        if len(drawn_points) and (view_xlim is None or view_ylim is None):
+            data_xlim, data_ylim = padded_limits(drawn_points, ax.margins())
+            view_xlim = data_xlim if view_xlim is None else view_xlim
+            view_ylim = data_ylim if view_ylim is None else view_ylim
+        if view_xlim is not None:
+            ax.set_xlim(view_xlim)
+        if view_ylim is not None:
+            ax.set_ylim(view_ylim)
+
+        if dark_mode:
+            ax.set_facecolor(face_color)
+        if legend_labels is not None and no_ax_input:
+            make_legend(legend_labels, loc=legend_loc, size=legend_size)
+        ax.axis("off")
+        plt.tight_layout()
+        if shaded_edges:
+            segments, weights, colors = zip(*shaded_edges)
+            color_indices = np.repeat(np.arange(len(colors)), [len(w) for w in weights])
+            shade_edges(
+                ax,
+                np.concatenate(segments),
+                np.concatenate(weights),
+                color_indices,
+                list(colors),
+                xlim=view_xlim,
+                ylim=view_ylim,
+                min_alpha=edge_alpha,
+            )
+
+        # Reading the view settles the autoscale requests made while drawing, so restoring the
+        # autoscale state keeps the computed limits. Explicit xlim/ylim keep autoscaling off
+        view = ax.get_xlim(), ax.get_ylim()
+        ax.set_autoscalex_on(autoscale_on[0] and xlim is None)
+        ax.set_autoscaley_on(autoscale_on[1] and ylim is None)
+        ax.set_xlim(view[0], auto=None)
+        ax.set_ylim(view[1], auto=None)
+        if no_ax_input:
+            plt.gcf().set_facecolor(face_color)
+            plt.show()
+        else:
+            return face_color
 
 
 def draw_graph_filtered(